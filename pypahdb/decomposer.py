@@ -8,24 +8,91 @@ information.
 
 """
 import copy
+import gc
+import io
+import multiprocessing
 import sys
+import textwrap
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone
+from itertools import product
 
 import matplotlib.gridspec as gridspec
 import matplotlib.pyplot as plt
 import numpy as np
 from astropy.io import fits
 from astropy.wcs import WCS
-from matplotlib import cm, colormaps, colors
+from matplotlib import colormaps
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 
 import pypahdb
 from pypahdb.decomposer_base import DecomposerBase
 
+try:
+    import fitsio
+except ImportError:
+    fitsio = None
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+# Colormap for the maps; looked up once so its lookup table is built once.
+_RAINBOW = colormaps["rainbow"]
+
+# Decomposer and fit figure shared with the worker processes that render
+# the fit pages.
+_plot_fit_decomposer = None
+_plot_fit_handles = None
+
+
+def _decomposer_init(decomposer):
+    """Share the decomposer with a worker in multiprocessing."""
+    global _plot_fit_decomposer, _plot_fit_handles
+    _plot_fit_decomposer = decomposer
+    _plot_fit_handles = decomposer._setup_fit_figure(fig=Figure())
+
+
+def _decomposer_plot_fit(ij, dpi=None):
+    """Render a single fit page to PDF in multiprocessing."""
+    _plot_fit_decomposer._update_fit_figure(_plot_fit_handles, *ij)
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        pdf.savefig(_plot_fit_handles["fig"], dpi=dpi)
+    return buf.getvalue()
+
+
+# Comments CFITSIO adds to a new primary HDU, which astropy does not write.
+_CFITSIO_COMMENTS = (
+    "FITS (Flexible Image Transport System) format is defined in 'Astronomy",
+    "and Astrophysics', volume 376, page 359; bibcode: 2001A&A...376..359H",
+)
+
+
+def _header_to_records(hdr):
+    """Convert a FITS header to fitsio records, i.e., the 80-character card
+    images astropy would write, leaving out the structural keywords fitsio
+    writes itself."""
+    structural = ("SIMPLE", "BITPIX", "NAXIS", "EXTEND")
+    return [
+        image[k:k + 80]
+        for card in hdr.cards
+        if not card.keyword.startswith(structural)
+        for image in (card.image,)
+        for k in range(0, len(image), 80)
+    ]
+
 
 class Decomposer(DecomposerBase):
-    """Extends DecomposerBase to write results to disk (PDF, FITS)."""
+    """Extends DecomposerBase to write results to disk (PDF, FITS, HDF5)."""
 
     def __init__(self, spectrum):
         """Initialize Decomposer object.
@@ -35,13 +102,18 @@ class Decomposer(DecomposerBase):
         Args:
             spectrum (specutils.Spectrum1D): The data to fit/decompose.
         """
+        self._spectra = None
+
         DecomposerBase.__init__(self, spectrum)
 
-    def save_pdf(self, filename, header="", domaps=True, doplots=True):
+    def save_pdf(self, filename, header="", domaps=True, doplots=True, dpi=150):
         """Save a PDF summary of the fit results.
 
         Notes:
-            None.
+            When pypdf is available and there is more than one pixel, the
+            fit pages are rendered in parallel and merged into the summary.
+            The fit pages are rendered headless, without involving the
+            pyplot backend.
 
         Args:
             filename (str): Path to save to.
@@ -50,13 +122,24 @@ class Decomposer(DecomposerBase):
         Keywords:
             domaps (bool): Save maps to PDF (defaults to True).
             doplots (bool): Save plots to PDF (defaults to True).
+            dpi (float): Resolution of rasterized content (defaults to 150).
 
         Returns:
             None.
 
         """
 
-        with PdfPages(filename) as pdf:
+        # Render the fit pages in parallel when pypdf can merge them and
+        # there is more than one page and worker to share them between.
+        n_workers = max(1, multiprocessing.cpu_count() - 1)
+        n_pages = np.prod(self.spectrum.flux.T.shape[1:])
+        parallel = (
+            doplots and PdfWriter is not None and n_workers > 1 and n_pages > 1
+        )
+
+        summary = io.BytesIO() if parallel else filename
+
+        with PdfPages(summary) as pdf:
             d = pdf.infodict()
             d["Title"] = "pyPAHdb Results Summary"
             d["Author"] = (
@@ -107,26 +190,104 @@ class Decomposer(DecomposerBase):
                     wcs = WCS(hdr)
                 else:
                     wcs = None
-                fig = self.plot_map(self.ionized_fraction, "ionized fraction", wcs=wcs)
-                pdf.savefig(fig)
-                plt.close(fig)
-                fig = self.plot_map(self.large_fraction, "large fraction", wcs=wcs)
-                pdf.savefig(fig)
-                plt.close(fig)
-                fig = self.plot_map(self.error, "error", wcs=wcs)
-                pdf.savefig(fig)
-                plt.close(fig)
-
-            if doplots:
-                ordinate = self.spectrum.flux.T
-                for i in range(ordinate.shape[1]):
-                    for j in range(ordinate.shape[2]):
-                        fig = self.plot_fit(i, j)
-                        pdf.savefig(fig)
-                        plt.close(fig)
+                maps = (
+                    (self.ionized_fraction, "ionized fraction"),
+                    (self.large_fraction, "large fraction"),
+                    (self.error, "error"),
+                )
+                for data, title in maps:
+                    fig = self.plot_map(data, title, wcs=wcs)
+                    if fig is None:
+                        continue
+                    pdf.savefig(fig, dpi=dpi)
+                    plt.close(fig)
+
+            if doplots and not parallel:
+                for fig in self._fit_figures():
+                    pdf.savefig(fig, dpi=dpi)
+
+        if parallel:
+            writer = PdfWriter(clone_from=summary)
+
+            # Compute the fit, breakdowns and maps, and prepare the per-pixel
+            # spectra before forking, so the workers share them instead of
+            # each recomputing them with pools of their own.
+            self._get_cube()
+            self._get_charge()
+            self._get_size()
+            self._pixel_spectra()
+
+            # Create the process pool.
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_decomposer_init,
+                initargs=(self,),
+            ) as executor:
+                futures = {
+                    executor.submit(_decomposer_plot_fit, ij, dpi=dpi): n
+                    for n, ij in enumerate(self._pixels())
+                }
+
+                # Append the pages in order as they complete, holding on only
+                # to those that finish ahead of their turn.
+                pages = {}
+                n_next = 0
+                for future in as_completed(futures):
+                    n = futures.pop(future)
+                    pages[n] = future.result()
+                    while n_next in pages:
+                        writer.append(io.BytesIO(pages.pop(n_next)))
+                        n_next += 1
+
+            # Share the fonts and resources each page was rendered with.
+            writer.compress_identical_objects()
+            writer.write(filename)
 
         return
 
+    def _pixel_spectra(self):
+        """Return the input flux and uncertainty with the spectral axis last.
+
+        Both are copied once into C order, so that the spectrum of a pixel
+        is contiguous in memory instead of a strided slice of the cube.
+
+        Returns:
+            self._spectra (tuple): Flux and uncertainty (quantity.Quantity),
+            indexed as [i, j]. The uncertainty is None when the spectrum
+            has none.
+        """
+
+        # Lazy Instantiation.
+        if self._spectra is None:
+            flux = np.moveaxis(self.spectrum.flux.T, 0, -1).copy(order="C")
+            unc = None
+            if self.spectrum.uncertainty:
+                unc = np.moveaxis(
+                    self.spectrum.uncertainty.quantity.T, 0, -1
+                ).copy(order="C")
+            self._spectra = (flux, unc)
+
+        return self._spectra
+
+    def _pixels(self):
+        """Return an iterator over the pixel coordinates, row by row."""
+        ordinate = self.spectrum.flux.T
+        return product(range(ordinate.shape[1]), range(ordinate.shape[2]))
+
+    def _fit_figures(self):
+        """Yield the fit figures one pixel at a time.
+
+        A single figure, detached from pyplot and its backend, is set up
+        once and only its data is updated for every pixel. Garbage is
+        collected every 50 figures to keep memory in check for large cubes.
+        """
+        handles = self._setup_fit_figure(fig=Figure())
+        for n, (i, j) in enumerate(self._pixels(), start=1):
+            self._update_fit_figure(handles, i, j)
+            yield handles["fig"]
+            if n % 50 == 0:
+                gc.collect()
+
     def save_fits(self, filename, header=""):
         """Save FITS file summary of the fit results.
 
@@ -135,88 +296,188 @@ class Decomposer(DecomposerBase):
             header (str): Optional, header for the FITS file.
         """
 
-        def _fits_to_disk(hdr, filename):
+        def _fits_to_disk(hdu, filename):
             """Writes the FITS file to disk, with header.
 
             Args:
-                hdr (fits.header.Header): FITS header.
+                hdu (fits.PrimaryHDU): FITS HDU.
                 filename (str): Path of FITS file to be saved.
             """
 
-            hdr["DATE"] = (datetime.today().isoformat(), "When this file was generated")
-            hdr["ORIGIN"] = (
-                "NASA Ames Research Center",
-                "Organization generating this file",
-            )
-            hdr["CREATOR"] = (
-                "pypahdb v{} (Python {}.{}.{})".format(
-                    pypahdb.__version__,
-                    sys.version_info.major,
-                    sys.version_info.minor,
-                    sys.version_info.micro,
-                ),
-                "Software used to create this file",
-            )
-            hdr["AUTHOR"] = (
-                "Dr. C. Boersma,  Dr. M.J. Shannon, and Dr. A. Maragkoudakis",
-                "Authors of the software",
-            )
-            cards = [
-                "PC3_3",
-                "CRPIX3",
-                "CRVAL3",
-                "CTYPE3",
-                "CDELT3",
-                "CUNIT3",
-                "PS3_0",
-                "PS3_1",
-                "WCSAXES",
-            ]
-            for c in cards:
-                if c in hdr:
-                    del hdr[c]
-            comments = (
-                "This file contains results from pypahdb.\n"
-                "Pypahdb was created as part of the JWST ERS Program "
-                "titled 'Radiative Feedback from Massive Stars as "
-                "Traced by Multiband Imaging and Spectroscopic "
-                "Mosaics' (ID 1288).\n"
-                "Visit https://github.com/pahdb/pypahdb/ for more "
-                "information on pypahdb."
-            )
-            for line in comments.split("\n"):
-                for chunk in [line[i: i + 72] for i in range(0, len(line), 72)]:
-                    hdr["COMMENT"] = chunk
-            hdr["COMMENT"] = "1st data plane contains the PAH ionization " "fraction."
-            hdr["COMMENT"] = "2nd data plane contains the PAH large fraction."
-            hdr["COMMENT"] = "3rd data plane contains the error."
-
-            # Write results to FITS-file.
-            hdu = fits.PrimaryHDU(
-                np.stack(
-                    (
-                        self.ionized_fraction.value,
-                        self.large_fraction.value,
-                        self.error.value,
-                    ),
-                    axis=0,
-                ),
-                header=hdr,
-            )
-            hdu.writeto(filename, overwrite=True, output_verify="fix")
+            if fitsio is not None:
+                # Let CFITSIO write the header and data.
+                hdu.verify("fix")
+                with fitsio.FITS(filename, "rw", clobber=True) as f:
+                    f.write(hdu.data, header=_header_to_records(hdu.header))
+
+                    # Drop the EXTEND keyword and the comments CFITSIO adds to
+                    # a new primary HDU, which astropy does not write. Those
+                    # comments precede any from the header and deleting a
+                    # COMMENT removes the first one.
+                    if "EXTEND" not in hdu.header:
+                        f[0].delete_key("EXTEND")
+                    for record in f[0].read_header_list():
+                        if record["name"] != "COMMENT":
+                            continue
+                        if record["value"].strip() not in _CFITSIO_COMMENTS:
+                            break
+                        f[0].delete_key("COMMENT")
+
+                return
+
+            if isinstance(hdu.data, np.memmap):
+                # Stream memory-mapped cubes to disk rather than pulling
+                # them into memory.
+                hdu.writeto(filename, overwrite=True, output_verify="fix")
+
+                return
+
+            # Serialize in memory and write to disk in one go, avoiding the
+            # many small writes that are slow on networked filesystems.
+            buf = io.BytesIO()
+            hdu.writeto(buf, output_verify="fix")
+            with open(filename, "wb") as f:
+                f.write(buf.getbuffer())
 
             return
 
         # Save results to FITS-file
+        _fits_to_disk(self._results_hdu(header), filename)
+
+        return
+
+    def save_hdf5(self, filename, header=""):
+        """Save HDF5 file summary of the fit results.
+
+        Notes:
+            Requires h5py. The file follows the HDFITS layout: the results
+            cube is the DATA dataset of the PRIMARY group and the header
+            keywords are attributes of that group, with COMMENT and HISTORY
+            cards collected as lists.
+
+        Args:
+            filename (str): Path to save to.
+            header (str): Optional, header for the HDF5 file.
+
+        Raises:
+            ImportError: When h5py is not installed.
+        """
+
+        if h5py is None:
+            raise ImportError("saving to HDF5 requires h5py")
+
+        hdu = self._results_hdu(header)
+
+        with h5py.File(filename, "w") as f:
+            group = f.create_group("PRIMARY")
+
+            # Chunk by plane, which is how the maps are read back.
+            group.create_dataset(
+                "DATA",
+                data=hdu.data,
+                chunks=(1,) + hdu.data.shape[1:],
+                compression="lzf",
+            )
+
+            commentary = {"COMMENT": [], "HISTORY": []}
+            for card in hdu.header.cards:
+                if card.keyword in commentary:
+                    commentary[card.keyword].append(str(card.value))
+                elif card.keyword:
+                    value = card.value
+                    if value is fits.card.UNDEFINED:
+                        value = ""
+                    group.attrs[card.keyword] = value
+            for keyword, values in commentary.items():
+                if values:
+                    group.attrs[keyword] = values
+
+        return
+
+    def _results_hdu(self, header=""):
+        """Return the fit results as a FITS primary HDU.
+
+        Args:
+            header (str): Optional, header to start from.
+
+        Returns:
+            hdu (fits.PrimaryHDU): The results cube with its header.
+        """
+
         if isinstance(header, fits.header.Header):
             # TODO: Clean up header.
             hdr = copy.deepcopy(header)
         else:
             hdr = fits.Header()
 
-        _fits_to_disk(hdr, filename)
+        # Set the keywords, and below append the comments, in one batch
+        # each rather than card by card.
+        hdr.update(
+            [
+                (
+                    "DATE",
+                    datetime.today().isoformat(),
+                    "When this file was generated",
+                ),
+                (
+                    "ORIGIN",
+                    "NASA Ames Research Center",
+                    "Organization generating this file",
+                ),
+                (
+                    "CREATOR",
+                    "pypahdb v{} (Python {}.{}.{})".format(
+                        pypahdb.__version__,
+                        sys.version_info.major,
+                        sys.version_info.minor,
+                        sys.version_info.micro,
+                    ),
+                    "Software used to create this file",
+                ),
+                (
+                    "AUTHOR",
+                    "Dr. C. Boersma,  Dr. M.J. Shannon, and Dr. A. Maragkoudakis",
+                    "Authors of the software",
+                ),
+            ]
+        )
+        cards = [
+            "PC3_3",
+            "CRPIX3",
+            "CRVAL3",
+            "CTYPE3",
+            "CDELT3",
+            "CUNIT3",
+            "PS3_0",
+            "PS3_1",
+            "WCSAXES",
+        ]
+        for c in cards:
+            if c in hdr:
+                del hdr[c]
+        comments = (
+            "This file contains results from pypahdb.\n"
+            "Pypahdb was created as part of the JWST ERS Program "
+            "titled 'Radiative Feedback from Massive Stars as "
+            "Traced by Multiband Imaging and Spectroscopic "
+            "Mosaics' (ID 1288).\n"
+            "Visit https://github.com/pahdb/pypahdb/ for more "
+            "information on pypahdb."
+        )
+        hdr.extend(
+            [
+                ("COMMENT", chunk)
+                for line in comments.split("\n")
+                for chunk in textwrap.wrap(line, 72)
+            ]
+            + [
+                ("COMMENT", "1st data plane contains the PAH ionization fraction."),
+                ("COMMENT", "2nd data plane contains the PAH large fraction."),
+                ("COMMENT", "3rd data plane contains the error."),
+            ]
+        )
 
-        return
+        return fits.PrimaryHDU(self._get_cube(), header=hdr)
 
     @staticmethod
     def plot_map(data, title, wcs=None):
@@ -233,24 +494,35 @@ class Decomposer(DecomposerBase):
             wcs (wcs.wcs): WCS (defaults to None).
 
         Returns:
-            fig (matplotlib.figure.Figure): Instance of figure.
+            fig (matplotlib.figure.Figure): Instance of figure, or None when
+                the image has no finite, non-zero values.
 
         """
-        m = np.nanmax(data)
+        # Nothing to show for an all-NaN or all-zero image.
+        if not np.any(np.asarray(data)[np.isfinite(data)]):
+            return None
 
-        im = data / m
-
-        cmap = colormaps["rainbow"]
+        m = np.nanmax(data)
 
-        x, y = np.meshgrid(np.arange(0, im.shape[1] + 1), np.arange(0, im.shape[0] + 1))
-        x = x.astype("float") - 0.5
-        y = y.astype("float") - 0.5
+        # Cell edges along each axis, broadcast once into the corner grid.
+        x = np.arange(data.shape[1] + 1) - 0.5
+        y = np.arange(data.shape[0] + 1) - 0.5
+        x, y = np.meshgrid(x, y)
 
         if wcs:
-            a, d = wcs.pixel_to_world_values(x, y)
             wcs_proj = wcs.deepcopy()
             wcs_proj.wcs.pc = [[-1, 0], [0, 1]]
-            x, y = wcs_proj.world_to_pixel_values(a, d)
+            if (
+                wcs.has_distortion
+                or wcs.wcs.has_cd()
+                or not np.allclose(wcs.wcs.get_pc(), np.eye(2))
+            ):
+                a, d = wcs.pixel_to_world_values(x, y)
+                x, y = wcs_proj.world_to_pixel_values(a, d)
+            else:
+                # Without rotation, projecting merely mirrors the first axis
+                # about the (zero-based) reference pixel.
+                x = 2.0 * (wcs.wcs.crpix[0] - 1.0) - x
             ax = plt.subplot(projection=wcs_proj)
         else:
             ax = plt.subplot()
@@ -261,17 +533,17 @@ class Decomposer(DecomposerBase):
         ax.set_xlim(x.min() - 1, x.max() + 1)
         ax.set_ylim(y.min() - 1, y.max() + 1)
 
-        args = list()
-        for i in range(im.shape[0]):
-            ii = [i, i + 1, i + 1, i, i]
-            for j in range(im.shape[1]):
-                if np.isfinite(im[i, j]):
-                    jj = [j, j, j + 1, j + 1, j]
-                    args += [x[ii, jj], y[ii, jj], colors.to_hex(cmap(im[i, j]))]
-        plt.fill(*tuple(args))
+        # x and y hold the cell corners; non-finite cells are masked and the
+        # colormap is applied to all cells at once through the mesh's norm.
+        # The mesh is rasterized so vector output does not hold one path per
+        # cell.
+        mesh = ax.pcolormesh(x, y, data, cmap=_RAINBOW, vmin=0.0, vmax=m, shading="flat")
+        mesh.set_rasterized(True)
 
         if wcs:
-            reverse = x[0, 0] < x[-1, 0]
+            # Keep east to the left when right ascension increases with the
+            # projected x-axis.
+            reverse = wcs_proj.pixel_scale_matrix[0, 0] > 0
             if reverse:
                 ax.invert_xaxis()
             plt.arrow(
@@ -357,17 +629,15 @@ class Decomposer(DecomposerBase):
         fig = plt.gcf()
         fig.set_layout_engine("constrained")
 
-        colorbar = cm.ScalarMappable(cmap=cmap)
-        colorbar.set_clim(0.0, m)
         cax = inset_axes(
             ax, width="2%", height="100%", loc="center right", borderpad=-1
         )
-        plt.colorbar(colorbar, cax=cax)
+        plt.colorbar(mesh, cax=cax)
         cax.set_ylabel(title)
 
         return fig
 
-    def plot_fit(self, i=0, j=0):
+    def plot_fit(self, i=0, j=0, fig=None):
         """Plots a fit and saves it to a PDF.
 
         Notes:
@@ -377,13 +647,39 @@ class Decomposer(DecomposerBase):
             i (int): Pixel coordinate (abscissa).
             j (int): Pixel coordinate (ordinate).
 
+        Keywords:
+            fig (matplotlib.figure.Figure): Figure to clear and reuse
+                (defaults to None).
+
         Returns:
             fig (matplotlib.figure.Figure): Instance of figure.
 
         """
 
+        handles = self._setup_fit_figure(fig=fig)
+        self._update_fit_figure(handles, i, j)
+
+        return handles["fig"]
+
+    def _setup_fit_figure(self, fig=None):
+        """Sets up the fit figure with everything that does not change from
+        pixel to pixel.
+
+        Keywords:
+            fig (matplotlib.figure.Figure): Figure to clear and reuse
+                (defaults to None).
+
+        Returns:
+            handles (dict): The figure, its axes, and the artists that
+            _update_fit_figure updates for each pixel.
+
+        """
+
         # Create figure on shared axes.
-        fig = plt.figure()
+        if fig is None:
+            fig = plt.figure()
+        else:
+            fig.clear()
         gs = gridspec.GridSpec(4, 1, height_ratios=[2, 1, 2, 2], figure=fig)
 
         # Add some spacing between axes.
@@ -399,94 +695,64 @@ class Decomposer(DecomposerBase):
         for ax in [ax0, ax1, ax2]:
             plt.setp(ax.get_xticklabels(), visible=False)
 
-        # Convenience definitions.
+        # Convenience definitions; lines start out empty.
         abscissa = self.spectrum.spectral_axis
-        charge = self.charge
+        empty = np.full(len(abscissa), np.nan)
         # Check if size of datapoints are too large and change marker size.
         ms = 5 if len(abscissa) < 1000 else 2
+        data_kwargs = dict(ls="none", marker=".", ms=ms, mew=0.5, color="black", zorder=0)
+        ylabel = f'{self.spectrum.meta["colnames"][1]} [{self.spectrum.flux.unit}]'
+
+        # The uncertainty bands are added per pixel.
+        handles = {"fig": fig, "axes": (ax0, ax1, ax2, ax3), "bands": [None] * 3}
 
         # ax0: Best fit.
-        data = self.spectrum.flux.T[:, i, j]
-        unc = None
-        if self.spectrum.uncertainty:
-            unc = self.spectrum.uncertainty.quantity.T[:, i, j]
-        model = self.fit[:, i, j]
-        ax0.errorbar(
-            abscissa,
-            data,
-            yerr=unc,
-            marker=".",
-            ms=ms,
-            mew=0.5,
-            lw=0,
-            color="black",
-            ecolor="grey",
-            capsize=2,
-            label="input",
-            zorder=0,
+        (handles["data0"],) = ax0.plot(abscissa, empty, label="input", **data_kwargs)
+        (handles["fit0"],) = ax0.plot(
+            abscissa, empty, label="fit", color="tab:red", lw=1.5
+        )
+        handles["error"] = ax0.text(
+            0.025, 0.88, "", ha="left", va="center", transform=ax0.transAxes
         )
-        ax0.plot(abscissa, model, label="fit", color="tab:red", lw=1.5)
-        error_str = "$error$=%-4.2f" % (self.error[i][j])
-        ax0.text(0.025, 0.88, error_str, ha="left", va="center", transform=ax0.transAxes)
-        ax0.set_ylabel(f'{self.spectrum.meta["colnames"][1]} [{self.spectrum.flux.unit}]')
+        ax0.set_ylabel(ylabel)
 
         # ax1: Residual.
-        ax1.plot(abscissa, data - model, lw=1, label="residual", color="gray")
+        (handles["residual"],) = ax1.plot(
+            abscissa, empty, lw=1, label="residual", color="gray"
+        )
         ax1.axhline(y=0, color="0.5", ls="--", dashes=(12, 16), zorder=-10, lw=0.5)
 
         # ax2: Size breakdown.
-        ax2.errorbar(
-            abscissa,
-            data,
-            yerr=unc,
-            marker=".",
-            ms=ms,
-            mew=0.5,
-            lw=0,
-            color="black",
-            ecolor="grey",
-            capsize=2,
-            zorder=0,
+        (handles["data2"],) = ax2.plot(abscissa, empty, **data_kwargs)
+        (handles["fit2"],) = ax2.plot(abscissa, empty, color="tab:red", lw=1.5)
+        (handles["large"],) = ax2.plot(
+            abscissa, empty, label="large", lw=1, color="tab:green"
         )
-        ax2.plot(abscissa, model, color="tab:red", lw=1.5)
-        ax2.plot(
-            abscissa, self.size["large"][:, i, j], label="large", lw=1, color="tab:green"
+        (handles["small"],) = ax2.plot(
+            abscissa, empty, label="small", lw=1, color="tab:blue"
         )
-        ax2.plot(
-            abscissa, self.size["small"][:, i, j], label="small", lw=1, color="tab:blue"
+        handles["size"] = ax2.text(
+            0.025, 0.88, "", ha="left", va="center", transform=ax2.transAxes
         )
-        size_str = "$f_{large}$=%3.1f" % (self.large_fraction[i][j])
-        ax2.text(0.025, 0.88, size_str, ha="left", va="center", transform=ax2.transAxes)
-        ax2.set_ylabel(f'{self.spectrum.meta["colnames"][1]} [{self.spectrum.flux.unit}]')
+        ax2.set_ylabel(ylabel)
 
         # ax3: Charge breakdown.
-        ax3.errorbar(
-            abscissa,
-            data,
-            yerr=unc,
-            marker=".",
-            ms=ms,
-            mew=0.5,
-            lw=0,
-            color="black",
-            ecolor="grey",
-            capsize=2,
-            zorder=0,
+        (handles["data3"],) = ax3.plot(abscissa, empty, **data_kwargs)
+        (handles["fit3"],) = ax3.plot(abscissa, empty, color="red", lw=1.5)
+        (handles["anion"],) = ax3.plot(
+            abscissa, empty, label="anion", lw=1, color="tab:orange"
         )
-        ax3.plot(abscissa, model, color="red", lw=1.5)
-        ax3.plot(
-            abscissa, charge["anion"][:, i, j], label="anion", lw=1, color="tab:orange"
+        (handles["neutral"],) = ax3.plot(
+            abscissa, empty, label="neutral", lw=1, color="tab:cyan"
         )
-        ax3.plot(
-            abscissa, charge["neutral"][:, i, j], label="neutral", lw=1, color="tab:cyan"
+        (handles["cation"],) = ax3.plot(
+            abscissa, empty, label="cation", lw=1, color="tab:purple"
         )
-        ax3.plot(
-            abscissa, charge["cation"][:, i, j], label="cation", lw=1, color="tab:purple"
+        handles["ion"] = ax3.text(
+            0.025, 0.88, "", ha="left", va="center", transform=ax3.transAxes
         )
-        ion_str = "$f_{ionized}$=%3.1f" % (self.ionized_fraction[i][j])
-        ax3.text(0.025, 0.88, ion_str, ha="left", va="center", transform=ax3.transAxes)
         ax3.set_xlabel(f'{self.spectrum.meta["colnames"][0]} [{self.spectrum.spectral_axis.unit}]')
-        ax3.set_ylabel(f'{self.spectrum.meta["colnames"][1]} [{self.spectrum.flux.unit}]')
+        ax3.set_ylabel(ylabel)
 
         # Set tick parameters and add legends to axes.
         for ax in (ax0, ax1, ax2, ax3):
@@ -498,4 +764,85 @@ class Decomposer(DecomposerBase):
 
         fig.set_layout_engine("constrained")
 
-        return fig
+        return handles
+
+    def _update_fit_figure(self, handles, i, j):
+        """Updates the fit figure set up by _setup_fit_figure for a pixel.
+
+        Args:
+            handles (dict): As returned by _setup_fit_figure.
+            i (int): Pixel coordinate (abscissa).
+            j (int): Pixel coordinate (ordinate).
+
+        """
+
+        # Convenience definitions.
+        abscissa = self.spectrum.spectral_axis
+        charge = self.charge
+        flux, uncertainty = self._pixel_spectra()
+        data = flux[i, j]
+        unc = None
+        if uncertainty is not None:
+            unc = uncertainty[i, j]
+        model = self.fit[:, i, j]
+
+        # Update the lines and annotations.
+        for key in ("data0", "data2", "data3"):
+            handles[key].set_ydata(data)
+        for key in ("fit0", "fit2", "fit3"):
+            handles[key].set_ydata(model)
+        handles["residual"].set_ydata(data - model)
+        handles["large"].set_ydata(self.size["large"][:, i, j])
+        handles["small"].set_ydata(self.size["small"][:, i, j])
+        handles["anion"].set_ydata(charge["anion"][:, i, j])
+        handles["neutral"].set_ydata(charge["neutral"][:, i, j])
+        handles["cation"].set_ydata(charge["cation"][:, i, j])
+        handles["error"].set_text("$error$=%-4.2f" % (self.error[i][j]))
+        handles["size"].set_text("$f_{large}$=%3.1f" % (self.large_fraction[i][j]))
+        handles["ion"].set_text("$f_{ionized}$=%3.1f" % (self.ionized_fraction[i][j]))
+
+        # Reset the data limits to the updated lines, leaving out the zero
+        # line on the residual, then recreate the uncertainty bands, which
+        # add their own extent.
+        ax0, ax1, ax2, ax3 = handles["axes"]
+        for ax in handles["axes"]:
+            ax.ignore_existing_data_limits = True
+        for key in (
+            "data0",
+            "fit0",
+            "residual",
+            "data2",
+            "fit2",
+            "large",
+            "small",
+            "data3",
+            "fit3",
+            "anion",
+            "neutral",
+            "cation",
+        ):
+            handles[key].axes.update_datalim(handles[key].get_xydata())
+
+        # Like axhline, let the zero line only extend the residual's limits
+        # when it falls outside of them.
+        ax1.autoscale_view()
+        ymin, ymax = ax1.get_ybound()
+        if not ymin <= 0.0 <= ymax:
+            ax1.update_datalim([(handles["residual"].get_xydata()[0, 0], 0.0)])
+
+        for n, ax in enumerate((ax0, ax2, ax3)):
+            if handles["bands"][n] is not None:
+                handles["bands"][n].remove()
+                handles["bands"][n] = None
+            if unc is not None:
+                handles["bands"][n] = ax.fill_between(
+                    abscissa.value,
+                    (data - unc).value,
+                    (data + unc).value,
+                    color="grey",
+                    alpha=0.3,
+                    lw=0,
+                    zorder=-1,
+                )
+        for ax in handles["axes"]:
+            ax.autoscale_view()
@@ -14,6 +14,7 @@ information.
 import multiprocessing
 import os
 import pickle
+import tempfile
 from functools import partial
 from urllib.request import urlretrieve
 
@@ -24,6 +25,9 @@ from astropy import units as u
 from scipy import optimize
 from specutils import Spectrum1D
 
+# Results cubes larger than this many bytes are backed by a temporary file.
+CUBE_MEMMAP_BYTES = 2**30
+
 
 def _decomposer_anion(w, m=None, p=None):
     """Do the anion decomposition in multiprocessing."""
@@ -87,6 +91,7 @@ class DecomposerBase(object):
         self._large_fraction = None
         self._charge = None
         self._size = None
+        self._cube = None
 
         # Check if spectrum is a Spectrum1D.
         if not isinstance(spectrum, Spectrum1D):
@@ -191,6 +196,18 @@ class DecomposerBase(object):
         new_shape = ordinate.shape[1:] + (self._matrix.shape[1],)
         self._weights = np.transpose(np.reshape(self._weights, new_shape), (2, 0, 1))
 
+        # Allocate the cube holding the ionized fraction, large fraction and
+        # error maps, which are computed into its planes. Single precision is
+        # ample for fractions and halves the memory to move when saving.
+        # Very large cubes are memory-mapped to keep them out of RAM.
+        cube_shape = (3,) + ordinate.shape[1:]
+        if np.prod(cube_shape) * np.dtype(np.float32).itemsize > CUBE_MEMMAP_BYTES:
+            self._cube = np.memmap(
+                tempfile.TemporaryFile(), dtype=np.float32, mode="w+", shape=cube_shape
+            )
+        else:
+            self._cube = np.empty(cube_shape, dtype=np.float32)
+
     def _fit(self):
         """Return the fit.
 
@@ -254,7 +271,7 @@ class DecomposerBase(object):
             total = np.trapz(ordinate, x=abscissa, axis=0)
 
             # Initialize result to NaN.
-            self._yerror = np.empty(ordinate.shape[1:])
+            self._yerror = self._cube[2]
             self._yerror.fill(np.nan)
 
             # Avoid division by -zero-.
@@ -264,7 +281,7 @@ class DecomposerBase(object):
             self._yerror[nonzero] = abs_residual[nonzero] / total[nonzero]
 
             # Set units.
-            self._yerror *= u.dimensionless_unscaled
+            self._yerror = self._yerror << u.dimensionless_unscaled
 
         return self._yerror
 
@@ -281,8 +298,10 @@ class DecomposerBase(object):
             # Compute ionized fraction.
             charge_matrix = self._precomputed["properties"]["charge"]
             ions = (charge_matrix > 0).astype(float)[:, None, None]
-            self._ionized_fraction = np.sum(self._weights * ions, axis=0)
-            self._ionized_fraction *= u.dimensionless_unscaled
+            self._ionized_fraction = np.sum(
+                self._weights * ions, axis=0, out=self._cube[0]
+            )
+            self._ionized_fraction = self._ionized_fraction << u.dimensionless_unscaled
 
             nonzero = np.nonzero(self._ionized_fraction)
 
@@ -307,8 +326,10 @@ class DecomposerBase(object):
             # Compute large fraction.
             size_matrix = self._precomputed["properties"]["size"]
             large = (size_matrix > 40).astype(float)[:, None, None]
-            self._large_fraction = np.sum(self._weights * large, axis=0)
-            self._large_fraction *= u.dimensionless_unscaled
+            self._large_fraction = np.sum(
+                self._weights * large, axis=0, out=self._cube[1]
+            )
+            self._large_fraction = self._large_fraction << u.dimensionless_unscaled
 
             nonzero = np.nonzero(self._large_fraction)
 
@@ -319,6 +340,21 @@ class DecomposerBase(object):
 
         return self._large_fraction
 
+    def _get_cube(self):
+        """Return the ionized fraction, large fraction and error maps.
+
+        Returns:
+            self._cube (numpy.ndarray): The maps stacked along the first
+            axis.
+        """
+
+        # Make sure all maps have been computed.
+        self._get_ionized_fraction()
+        self._get_large_fraction()
+        self._error()
+
+        return self._cube
+
     def _get_charge(self):
         """Return the spectral charge breakdown from fit.
 
@@ -6,10 +6,14 @@ test_spectrum.py: unit tests for class decomposer.
 """
 
 import unittest
+from importlib.util import find_spec
+from unittest.mock import patch
 import os.path
 import numpy as np
 import matplotlib
+import matplotlib.pyplot as plt
 
+from astropy.io import fits
 from astropy.wcs import WCS
 
 from pypahdb.observation import Observation
@@ -58,16 +62,151 @@ class DecomposerTestCase(unittest.TestCase):
         self.decomposer.save_pdf(ofile)
         assert os.path.isfile(ofile)
 
+    def test_do_pdf_cube(self):
+        """Can we output a PDF for a spectral cube?"""
+        import importlib_resources
+        file_name = 'resources/sample_data_NGC7023.fits'
+        file_path = importlib_resources.files('pypahdb') / file_name
+        observation = Observation(file_path)
+        decomposer = Decomposer(observation.spectrum[:2, :3])
+        ofile = os.path.join(self.tmpdir, "result_cube.pdf")
+        decomposer.save_pdf(ofile)
+        assert os.path.isfile(ofile)
+        assert decomposer._charge is not None
+        assert decomposer._size is not None
+
     def test_do_fits(self):
         """Can we output FITS?"""
         ofile = os.path.join(self.tmpdir, "result.pdf")
         self.decomposer.save_fits(ofile)
         assert os.path.isfile(ofile)
 
+    @unittest.skipIf(find_spec("fitsio") is None, "fitsio is not installed")
+    def test_do_fits_fitsio(self):
+        """Do fitsio and astropy write the same FITS file?"""
+        # Add a separator of blank cards, as in JWST headers, and a card
+        # without a value.
+        header = fits.Header(list(self.observation.header.cards) + [
+            ("", ""),
+            ("", "Information about the coordinates in the file"),
+            ("", ""),
+            ("EMPTYKEY", fits.card.UNDEFINED, "Keyword without a value"),
+        ])
+        fitsio_file = os.path.join(self.tmpdir, "result_fitsio.fits")
+        self.decomposer.save_fits(fitsio_file, header=header)
+        astropy_file = os.path.join(self.tmpdir, "result_astropy.fits")
+        with patch("pypahdb.decomposer.fitsio", None):
+            self.decomposer.save_fits(astropy_file, header=header)
+        with fits.open(fitsio_file) as f1, fits.open(astropy_file) as f2:
+            np.testing.assert_array_equal(f1[0].data, f2[0].data)
+            cards1 = [(c.keyword, c.value) for c in f1[0].header.cards
+                      if c.keyword != "DATE"]
+            cards2 = [(c.keyword, c.value) for c in f2[0].header.cards
+                      if c.keyword != "DATE"]
+            assert cards1 == cards2
+            assert ("", "Information about the coordinates in the file") in cards1
+            assert ("", "") in cards1
+            assert ("EMPTYKEY", fits.card.UNDEFINED) in cards1
+
+    def test_do_fits_memmap(self):
+        """Can we output FITS from a memory-mapped results cube?"""
+        with patch("pypahdb.decomposer_base.CUBE_MEMMAP_BYTES", 0):
+            decomposer = Decomposer(self.observation.spectrum)
+        assert isinstance(decomposer._cube, np.memmap)
+        for plane, data in enumerate((decomposer.ionized_fraction,
+                                      decomposer.large_fraction,
+                                      decomposer.error)):
+            assert np.shares_memory(data, decomposer._cube[plane])
+        ofile = os.path.join(self.tmpdir, "result_memmap.fits")
+        with patch("pypahdb.decomposer.fitsio", None):
+            decomposer.save_fits(ofile)
+        np.testing.assert_array_equal(fits.getdata(ofile), decomposer._cube)
+
+    @unittest.skipIf(find_spec("h5py") is None, "h5py is not installed")
+    def test_do_hdf5(self):
+        """Can we output HDF5?"""
+        import h5py
+        ofile = os.path.join(self.tmpdir, "result.h5")
+        self.decomposer.save_hdf5(ofile)
+        assert os.path.isfile(ofile)
+        with h5py.File(ofile, "r") as f:
+            data = f["PRIMARY/DATA"]
+            shape = (3,) + self.decomposer.ionized_fraction.shape
+            assert data.shape == shape
+            assert data.dtype == np.float32
+            assert data.chunks == (1,) + shape[1:]
+            attrs = f["PRIMARY"].attrs
+            assert "DATE" in attrs
+            assert len(attrs["COMMENT"]) > 1
+            assert attrs["COMMENT"][-1] == "3rd data plane contains the error."
+
+    def test_do_hdf5_without_h5py(self):
+        """Do we refuse to output HDF5 without h5py?"""
+        ofile = os.path.join(self.tmpdir, "result.h5")
+        with patch("pypahdb.decomposer.h5py", None):
+            with self.assertRaises(ImportError):
+                self.decomposer.save_hdf5(ofile)
+
+    def test_plot_fit_uncertainty(self):
+        """Do we shade the uncertainty, once, on the fit figure?"""
+        from astropy.nddata import StdDevUncertainty
+        from matplotlib.collections import PolyCollection
+        from specutils import Spectrum1D
+        spectrum = self.observation.spectrum
+        flux = np.concatenate([spectrum.flux, 0.5 * spectrum.flux])
+        spectrum = Spectrum1D(flux, spectral_axis=spectrum.spectral_axis,
+                              uncertainty=StdDevUncertainty(0.1 * flux.value),
+                              meta=spectrum.meta)
+        decomposer = Decomposer(spectrum)
+
+        def bands(fig):
+            return [sum(isinstance(c, PolyCollection) for c in ax.collections)
+                    for ax in fig.axes]
+
+        fig = decomposer.plot_fit()
+        assert bands(fig) == [1, 0, 1, 1]
+        handles = decomposer._setup_fit_figure(fig=matplotlib.figure.Figure())
+        decomposer._update_fit_figure(handles, 0, 0)
+        decomposer._update_fit_figure(handles, 0, 1)
+        assert bands(handles["fig"]) == [1, 0, 1, 1]
+        plt.close(fig)
+
     def test_plot_map(self):
         assert isinstance(Decomposer.plot_map(
             np.ones((1, 1)), "dummy", WCS()), matplotlib.figure.Figure)
 
+    def test_plot_map_wcs(self):
+        """Does the unrotated shortcut match the full WCS projection?"""
+        data = np.ones((14, 15))
+        corners = []
+        for angle in (0.0, 1e-6):
+            plt.close("all")
+            wcs = WCS(naxis=2)
+            wcs.wcs.ctype = ["RA---TAN", "DEC--TAN"]
+            wcs.wcs.crval = [315.38, 68.17]
+            wcs.wcs.crpix = [8.0, 7.25]
+            wcs.wcs.cdelt = [-0.001, 0.001]
+            wcs.wcs.pc = [[np.cos(angle), -np.sin(angle)],
+                          [np.sin(angle), np.cos(angle)]]
+            fig = Decomposer.plot_map(data, "dummy", wcs)
+            ax = fig.axes[0]
+            corners.append(ax.collections[0].get_coordinates())
+
+            # East, i.e., increasing right ascension, is to the left.
+            wcs_proj = wcs.deepcopy()
+            wcs_proj.wcs.pc = [[-1, 0], [0, 1]]
+            (left, right), (bottom, top) = ax.get_xlim(), ax.get_ylim()
+            ra, _ = wcs_proj.pixel_to_world_values(
+                [left, right], [(bottom + top) / 2.0] * 2)
+            assert ax.xaxis_inverted()
+            assert ra[0] > ra[1]
+        np.testing.assert_allclose(corners[0], corners[1], atol=1e-3)
+
+    def test_plot_map_empty(self):
+        """Do we skip maps without data?"""
+        assert Decomposer.plot_map(np.full((2, 2), np.nan), "dummy") is None
+        assert Decomposer.plot_map(np.zeros((2, 2)), "dummy") is None
+
 
 if __name__ == '__main__':
     unittest.main()